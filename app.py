@@ -4,17 +4,16 @@ A Streamlit web application for validating canonical tags across websites
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import requests
-from urllib.parse import urljoin, urlparse
+import concurrent.futures
 import time
-from typing import List, Dict, Tuple, Optional
-import validators
+from typing import List, Dict
 
-from utils.robots_parser import RobotsParser
-from utils.sitemap_parser import SitemapParser
-from utils.url_processor import URLProcessor
-from utils.report_generator import ReportGenerator
+from utils.url_validate import bulk_valid
+
+# The utils modules below pull in requests, aiohttp and lxml; they are
+# imported inside the functions that need them to keep cold start lean.
 
 # Page configuration
 st.set_page_config(
@@ -24,6 +23,34 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Cap on rows sent to the browser table; full data remains in exports
+MAX_DISPLAY_ROWS = 1000
+
+# Metric labels for the status breakdown panel; unknown statuses fall
+# back to their own name
+STATUS_METRIC_LABELS = {
+    "Match": "✅ Matches",
+    "Mismatch": "❌ Mismatches",
+    "Error": "⚠️ Errors",
+}
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False, persist="disk")
+def _cached_discover(domain: str) -> List[Dict]:
+    """Discover sitemaps for a domain, cached to skip repeated network I/O"""
+    from utils.robots_parser import RobotsParser
+    return RobotsParser().discover_sitemaps(domain)
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False, persist="disk")
+def _cached_extract(sitemap_url: str) -> List[str]:
+    """Extract URLs from a sitemap, cached to skip repeated fetch and parse"""
+    from utils.sitemap_parser import SitemapParser
+    return SitemapParser().extract_urls(sitemap_url)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _preview_validity(preview_urls: tuple) -> List[bool]:
+    """Validity mask for the preview slice, cached across reruns"""
+    return bulk_valid(list(preview_urls))
+
 def main():
     """Main application function"""
     
@@ -134,16 +161,13 @@ def main():
                 
                 # Display discovered sitemaps
                 st.subheader("Discovered Sitemaps")
-                sitemap_data = []
-                for sitemap in st.session_state.discovered_sitemaps:
-                    sitemap_data.append({
-                        "Sitemap URL": sitemap["url"],
-                        "Type": sitemap["type"],
-                        "Status": sitemap["status"],
-                        "URL Count": sitemap.get("url_count", "Unknown")
-                    })
-                
-                df_sitemaps = pd.DataFrame(sitemap_data)
+                discovered = st.session_state.discovered_sitemaps
+                df_sitemaps = pd.DataFrame({
+                    "Sitemap URL": [s["url"] for s in discovered],
+                    "Type": [s["type"] for s in discovered],
+                    "Status": [s["status"] for s in discovered],
+                    "URL Count": [s.get("url_count", "Unknown") for s in discovered]
+                })
                 st.dataframe(df_sitemaps, use_container_width=True)
                 
                 # Multi-select for sitemaps
@@ -175,14 +199,17 @@ def main():
             )
             
             if manual_url_text:
-                manual_urls = [url.strip() for url in manual_url_text.split('\n') if url.strip()]
+                # Split and strip all lines in vectorized C loops
+                lines = np.char.strip(np.array(manual_url_text.splitlines(), dtype=str))
+                manual_urls = lines[lines != ''].tolist()
                 st.info(f"📄 {len(manual_urls)} URLs entered manually")
                 
                 # Show preview of URLs
                 if len(manual_urls) > 0:
                     with st.expander(f"👁️ Preview URLs ({len(manual_urls)} total)"):
-                        for i, url in enumerate(manual_urls[:10], 1):  # Show first 10
-                            if validators.url(url):
+                        preview_urls = manual_urls[:10]  # Show first 10
+                        for i, (url, is_valid) in enumerate(zip(preview_urls, _preview_validity(tuple(preview_urls))), 1):
+                            if is_valid:
                                 st.markdown(f"{i}. ✅ `{url}`")
                             else:
                                 st.markdown(f"{i}. ❌ `{url}` (invalid)")
@@ -209,7 +236,7 @@ def main():
                     extract_urls(url_source, manual_urls)
         
         # Process URLs section - dynamic step numbering
-        if st.session_state.extracted_urls:
+        if len(st.session_state.extracted_urls) > 0:
             if url_source == "📝 Manual URL List":
                 final_step = "Step 4"
             elif url_source == "🗺️ From Website Sitemaps":
@@ -244,7 +271,7 @@ def main():
                 st.metric("Selected Sitemaps", len(st.session_state.selected_sitemaps))
         
         # URL metrics
-        if st.session_state.extracted_urls:
+        if len(st.session_state.extracted_urls) > 0:
             st.metric("URLs Ready", len(st.session_state.extracted_urls))
         
         # Results metrics
@@ -254,16 +281,12 @@ def main():
             
             # Status breakdown
             st.markdown("**Results Breakdown:**")
+            # value_counts on the categorical column is a C-level bincount
+            # over int8 codes; it reports every category, so skip empty ones
             status_counts = results_df['Status'].value_counts()
             for status, count in status_counts.items():
-                if status == "Match":
-                    st.metric("✅ Matches", count)
-                elif status == "Mismatch":
-                    st.metric("❌ Mismatches", count)
-                elif status == "Error":
-                    st.metric("⚠️ Errors", count)
-                else:
-                    st.metric(status, count)
+                if count > 0:
+                    st.metric(STATUS_METRIC_LABELS.get(status, status), count)
         
         # Quick help section
         st.markdown("---")
@@ -292,9 +315,8 @@ def main():
 def discover_sitemaps(domain: str):
     """Discover sitemaps from robots.txt"""
     try:
-        robots_parser = RobotsParser()
-        sitemaps = robots_parser.discover_sitemaps(domain)
-        
+        sitemaps = _cached_discover(domain)
+
         if sitemaps:
             st.session_state.discovered_sitemaps = sitemaps
             st.success(f"✅ Found {len(sitemaps)} sitemap(s)")
@@ -309,34 +331,46 @@ def discover_sitemaps(domain: str):
 def extract_urls(url_source: str, manual_urls: List[str]):
     """Extract URLs from selected sources"""
     try:
-        all_urls = set()
-        
+        # Accumulate URL batches and deduplicate once at the end
+        url_chunks = []
+
         # From sitemaps
         if url_source in ["🗺️ From Website Sitemaps", "🔄 Both Methods"] and st.session_state.selected_sitemaps:
-            sitemap_parser = SitemapParser()
-            for sitemap in st.session_state.selected_sitemaps:
-                urls = sitemap_parser.extract_urls(sitemap["url"])
-                all_urls.update(urls)
-                st.info(f"📄 Extracted {len(urls)} URLs from {sitemap['url']}")
+            # Fetch and parse the selected sitemaps concurrently; status
+            # messages stay on the main thread as results come back in order
+            sitemap_urls = [sitemap["url"] for sitemap in st.session_state.selected_sitemaps]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(sitemap_urls))) as executor:
+                for sitemap_url, urls in zip(sitemap_urls, executor.map(_cached_extract, sitemap_urls)):
+                    url_chunks.append(np.asarray(urls, dtype=object))
+                    st.info(f"📄 Extracted {len(urls)} URLs from {sitemap_url}")
         
         # From manual input
         if url_source in ["📝 Manual URL List", "🔄 Both Methods"] and manual_urls:
-            # Validate manual URLs
-            valid_manual_urls = []
-            invalid_count = 0
-            for url in manual_urls:
-                if validators.url(url):
-                    valid_manual_urls.append(url)
-                else:
-                    invalid_count += 1
-                    st.warning(f"⚠️ Invalid URL skipped: {url}")
+            # Drop duplicate pastes first, preserving input order
+            manual_urls = list(dict.fromkeys(manual_urls))
+
+            # Validate all manual URLs in a single scan; invalid ones are
+            # reported in one bulk warning below instead of one widget each
+            valid_manual_urls = [
+                url for url, is_valid in zip(manual_urls, bulk_valid(manual_urls)) if is_valid
+            ]
+            invalid_count = len(manual_urls) - len(valid_manual_urls)
             
-            all_urls.update(valid_manual_urls)
+            url_chunks.append(np.asarray(valid_manual_urls, dtype=object))
             st.info(f"📝 Added {len(valid_manual_urls)} valid manual URLs")
             if invalid_count > 0:
                 st.warning(f"⚠️ {invalid_count} invalid URLs were skipped")
-        
-        st.session_state.extracted_urls = list(all_urls)
+
+        # Single hashed dedup pass in C instead of per-element set updates
+        if url_chunks:
+            all_urls = pd.unique(np.concatenate(url_chunks))
+        else:
+            all_urls = np.empty(0, dtype=object)
+
+        # Park the URLs in session state as one contiguous Arrow string
+        # buffer (UTF-8 bytes + offsets) instead of a PyObject per URL
+        import pyarrow as pa
+        st.session_state.extracted_urls = pa.array(all_urls, type=pa.string())
         st.success(f"✅ Total unique URLs extracted: {len(st.session_state.extracted_urls)}")
         
     except Exception as e:
@@ -346,6 +380,8 @@ def process_urls(concurrent_requests: int, request_timeout: int, max_retries: in
                 force_https: bool, remove_trailing_slash: bool, ignore_query_params: bool):
     """Process URLs and analyze canonical tags"""
     try:
+        from utils.url_processor import URLProcessor, STATUS_CATEGORIES
+
         url_processor = URLProcessor(
             concurrent_requests=concurrent_requests,
             request_timeout=request_timeout,
@@ -364,11 +400,15 @@ def process_urls(concurrent_requests: int, request_timeout: int, max_retries: in
             progress_bar.progress(progress)
             status_text.text(f"Processing {processed}/{total}: {current_url}")
         
-        # Process URLs
-        results = url_processor.process_urls(st.session_state.extracted_urls, update_progress)
-        
-        # Convert results to DataFrame
-        st.session_state.results = pd.DataFrame(results)
+        # Process URLs; materialize Python strings only at this boundary
+        columns = url_processor.process_urls(
+            st.session_state.extracted_urls.to_pylist(), update_progress
+        )
+
+        # Build the DataFrame from column arrays; Status becomes categorical
+        # (int8 codes) so downstream counts and filters skip object dtype
+        columns['Status'] = pd.Categorical(columns['Status'], categories=STATUS_CATEGORIES)
+        st.session_state.results = pd.DataFrame(columns, copy=False)
         
         # Clear progress indicators
         progress_bar.empty()
@@ -382,15 +422,19 @@ def process_urls(concurrent_requests: int, request_timeout: int, max_retries: in
 def display_results(export_format: str):
     """Display and export results"""
     results_df = st.session_state.results
-    
+
+    # Count statuses once; metrics and filter options below reuse this pass
+    status_counts = results_df['Status'].value_counts()
+    statuses = status_counts[status_counts > 0].index.tolist()
+
     # Filter options
     col1, col2, col3 = st.columns(3)
-    
+
     with col1:
         status_filter = st.multiselect(
             "Filter by Status:",
-            options=results_df['Status'].unique(),
-            default=results_df['Status'].unique()
+            options=statuses,
+            default=statuses
         )
     
     with col2:
@@ -400,16 +444,18 @@ def display_results(export_format: str):
         if st.button("📥 Export Results"):
             export_results(results_df, export_format)
     
-    # Apply filters
-    filtered_df = results_df[results_df['Status'].isin(status_filter)]
-    
+    # Apply filters with a single boolean mask
+    mask = results_df['Status'].isin(status_filter)
     if show_only_mismatches:
-        filtered_df = filtered_df[filtered_df['Status'] == 'Mismatch']
+        mask &= results_df['Status'].eq('Mismatch')
+    filtered_df = results_df.loc[mask]
     
-    # Display results table
+    # Display results table; only serialize the first slice to the browser
     st.dataframe(
-        filtered_df,
+        filtered_df.head(MAX_DISPLAY_ROWS),
         use_container_width=True,
+        hide_index=True,
+        height=600,
         column_config={
             "URL": st.column_config.LinkColumn("URL"),
             "Canonical URL": st.column_config.LinkColumn("Canonical URL"),
@@ -417,6 +463,8 @@ def display_results(export_format: str):
             "Error": st.column_config.TextColumn("Error Details")
         }
     )
+    if len(filtered_df) > MAX_DISPLAY_ROWS:
+        st.caption(f"Showing first {MAX_DISPLAY_ROWS:,} of {len(filtered_df):,} rows - use export for the full set")
     
     # Summary statistics
     st.subheader("📈 Summary Statistics")
@@ -425,18 +473,17 @@ def display_results(export_format: str):
     with col1:
         st.metric("Total URLs", len(results_df))
     with col2:
-        matches = len(results_df[results_df['Status'] == 'Match'])
-        st.metric("Matches", matches)
+        st.metric("Matches", status_counts.get('Match', 0))
     with col3:
-        mismatches = len(results_df[results_df['Status'] == 'Mismatch'])
-        st.metric("Mismatches", mismatches)
+        st.metric("Mismatches", status_counts.get('Mismatch', 0))
     with col4:
-        errors = len(results_df[results_df['Status'] == 'Error'])
-        st.metric("Errors", errors)
+        st.metric("Errors", status_counts.get('Error', 0))
 
 def export_results(results_df: pd.DataFrame, export_format: str):
     """Export results to file"""
     try:
+        from utils.report_generator import ReportGenerator
+
         report_generator = ReportGenerator()
         
         if export_format == "CSV":
@@ -2,10 +2,10 @@
 Report generator for exporting analysis results
 """
 
+import numpy as np
 import pandas as pd
-from io import BytesIO, StringIO
+from io import BytesIO
 from typing import Dict, List
-import json
 
 class ReportGenerator:
     """Generator for various report formats"""
@@ -13,43 +13,69 @@ class ReportGenerator:
     def __init__(self):
         pass
     
-    def export_csv(self, results_df: pd.DataFrame) -> str:
+    def export_csv(self, results_df: pd.DataFrame) -> bytes:
         """Export results to CSV format"""
-        # Create string buffer
-        output = StringIO()
-        
-        # Write CSV
-        results_df.to_csv(output, index=False, encoding='utf-8')
-        
-        # Get CSV string
-        csv_string = output.getvalue()
+        # Stream encoded CSV straight into a bytes buffer in chunks,
+        # avoiding a full intermediate Python string
+        output = BytesIO()
+        results_df.to_csv(output, index=False, encoding='utf-8',
+                          lineterminator='\n', chunksize=10000)
+
+        csv_bytes = output.getvalue()
         output.close()
-        
-        return csv_string
+
+        return csv_bytes
     
     def export_excel(self, results_df: pd.DataFrame) -> bytes:
         """Export results to Excel format with multiple sheets"""
         # Create bytes buffer
         output = BytesIO()
         
-        # Create Excel writer
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Main results sheet
-            results_df.to_excel(writer, sheet_name='All Results', index=False)
-            
-            # Summary sheet
-            summary_df = self._create_summary_dataframe(results_df)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        # Create Excel writer; constant_memory streams rows out as they are
+        # written instead of holding the whole workbook object tree
+        with pd.ExcelWriter(
+            output,
+            engine='xlsxwriter',
+            engine_kwargs={'options': {'constant_memory': True,
+                                       'strings_to_urls': False}}
+        ) as writer:
+            # Main results sheet. In constant_memory mode rows must be
+            # written strictly top-to-bottom - pandas' to_excel emits cells
+            # column-by-column, which that mode silently discards - so all
+            # data sheets go through the row-streaming writer below.
+            self._write_frame_sheet(writer, 'All Results', results_df)
+
+            # Summary sheet, written cell-by-cell straight into the workbook;
+            # a throwaway DataFrame buys nothing for a couple dozen rows
+            headers, rows = self._summary_rows(results_df)
+            summary_sheet = writer.book.add_worksheet('Summary')
+            summary_sheet.write_row(0, 0, headers)
+            for row_idx, row in enumerate(rows, 1):
+                summary_sheet.write_row(row_idx, 0, row)
             
+            # Derive both sheet masks from one pass over the Status codes
+            status = results_df['Status']
+            if not isinstance(status.dtype, pd.CategoricalDtype):
+                status = status.astype('category')
+            codes = status.cat.codes.to_numpy()
+            categories = status.cat.categories
+
+            issue_codes = [categories.get_loc(c)
+                           for c in ('Mismatch', 'Error', 'Multiple', 'Empty')
+                           if c in categories]
+            issues_mask = np.isin(codes, issue_codes)
+            if 'Match' in categories:
+                matches_mask = codes == categories.get_loc('Match')
+            else:
+                matches_mask = np.zeros(len(codes), dtype=bool)
+
             # Issues sheet (mismatches and errors)
-            issues_df = results_df[results_df['Status'].isin(['Mismatch', 'Error', 'Multiple', 'Empty'])]
-            if not issues_df.empty:
-                issues_df.to_excel(writer, sheet_name='Issues', index=False)
-            
+            if issues_mask.any():
+                self._write_frame_sheet(writer, 'Issues', results_df.loc[issues_mask])
+
             # Matches sheet
-            matches_df = results_df[results_df['Status'] == 'Match']
-            if not matches_df.empty:
-                matches_df.to_excel(writer, sheet_name='Matches', index=False)
+            if matches_mask.any():
+                self._write_frame_sheet(writer, 'Matches', results_df.loc[matches_mask])
         
         # Get Excel bytes
         excel_bytes = output.getvalue()
@@ -57,56 +83,69 @@ class ReportGenerator:
         
         return excel_bytes
     
-    def _create_summary_dataframe(self, results_df: pd.DataFrame) -> pd.DataFrame:
-        """Create summary statistics dataframe"""
+    @staticmethod
+    def _write_frame_sheet(writer, sheet_name: str, frame: pd.DataFrame):
+        """Write a DataFrame to a worksheet one row at a time
+
+        Emits rows strictly top-to-bottom, which is what xlsxwriter's
+        constant_memory mode requires; NaN cells are written as blanks.
+        """
+        worksheet = writer.book.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(column) for column in frame.columns])
+        for row_idx, row in enumerate(frame.itertuples(index=False, name=None), 1):
+            worksheet.write_row(
+                row_idx, 0,
+                [None if pd.isna(value) else value for value in row]
+            )
+
+    def _summary_rows(self, results_df: pd.DataFrame,
+                      status_counts: pd.Series = None):
+        """Summary statistics as a (headers, rows) pair of plain tuples"""
         total_urls = len(results_df)
-        
-        # Count by status
-        status_counts = results_df['Status'].value_counts()
-        
-        # Calculate percentages
-        summary_data = []
-        
-        for status, count in status_counts.items():
-            percentage = (count / total_urls) * 100
-            summary_data.append({
-                'Status': status,
-                'Count': count,
-                'Percentage': f"{percentage:.1f}%"
-            })
-        
-        # Add total row
-        summary_data.append({
-            'Status': 'TOTAL',
-            'Count': total_urls,
-            'Percentage': '100.0%'
-        })
-        
-        # Additional metrics
+
+        # Count by status (reuse the caller's pass when available)
+        if status_counts is None:
+            status_counts = results_df['Status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
+
+        # Status rows, with percentages computed as one vectorized expression
+        percentages = status_counts / total_urls * 100
+        rows = list(zip(
+            status_counts.index.astype(str),
+            status_counts.to_numpy().tolist(),
+            percentages.map('{:.1f}%'.format)
+        ))
+
+        # Total row plus additional scalar metrics
+        rows.append(('TOTAL', total_urls, '100.0%'))
+
         if 'Response Time' in results_df.columns:
             avg_response_time = results_df['Response Time'].mean()
             if pd.notna(avg_response_time):
-                summary_data.append({
-                    'Status': 'Avg Response Time',
-                    'Count': f"{avg_response_time:.2f}s",
-                    'Percentage': ''
-                })
-        
-        # HTTP status codes
+                rows.append(('Avg Response Time', f"{avg_response_time:.2f}s", ''))
+
+        # HTTP status codes in a single groupby pass (NaN keys are dropped)
         if 'HTTP Status' in results_df.columns:
-            http_status_counts = results_df['HTTP Status'].value_counts()
-            for status_code, count in http_status_counts.items():
-                if pd.notna(status_code):
-                    summary_data.append({
-                        'Status': f'HTTP {status_code}',
-                        'Count': count,
-                        'Percentage': f"{(count / total_urls) * 100:.1f}%"
-                    })
-        
-        return pd.DataFrame(summary_data)
+            http_status_counts = results_df.groupby('HTTP Status').size()
+            http_percentages = http_status_counts / total_urls * 100
+            rows.extend(zip(
+                ('HTTP ' + http_status_counts.index.astype(str)),
+                http_status_counts.to_numpy().tolist(),
+                http_percentages.map('{:.1f}%'.format)
+            ))
+
+        return ('Status', 'Count', 'Percentage'), rows
+
+    def _create_summary_dataframe(self, results_df: pd.DataFrame,
+                                  status_counts: pd.Series = None) -> pd.DataFrame:
+        """Create summary statistics dataframe"""
+        headers, rows = self._summary_rows(results_df, status_counts)
+        return pd.DataFrame(rows, columns=list(headers))
     
     def export_json(self, results_df: pd.DataFrame) -> str:
         """Export results to JSON format"""
+        import json
+
         # Convert DataFrame to dictionary
         results_dict = results_df.to_dict('records')
         
@@ -122,32 +161,40 @@ class ReportGenerator:
         
         return json.dumps(export_data, indent=2, default=str)
     
-    def _get_summary_stats(self, results_df: pd.DataFrame) -> Dict:
+    def _get_summary_stats(self, results_df: pd.DataFrame,
+                           status_counts: pd.Series = None) -> Dict:
         """Get summary statistics as dictionary"""
-        status_counts = results_df['Status'].value_counts().to_dict()
-        
+        if status_counts is None:
+            status_counts = results_df['Status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
+
         summary = {
             'total_urls': len(results_df),
-            'status_breakdown': status_counts
+            'status_breakdown': status_counts.to_dict()
         }
-        
-        # Add response time stats if available
+
+        # Add response time stats if available, aggregated in one pass
         if 'Response Time' in results_df.columns:
             response_times = results_df['Response Time'].dropna()
             if not response_times.empty:
+                stats = response_times.agg(['mean', 'median', 'min', 'max'])
                 summary['response_time_stats'] = {
-                    'average': float(response_times.mean()),
-                    'median': float(response_times.median()),
-                    'min': float(response_times.min()),
-                    'max': float(response_times.max())
+                    'average': float(stats['mean']),
+                    'median': float(stats['median']),
+                    'min': float(stats['min']),
+                    'max': float(stats['max'])
                 }
-        
+
         return summary
     
     def create_detailed_report(self, results_df: pd.DataFrame) -> str:
         """Create a detailed text report"""
         total_urls = len(results_df)
+
+        # On the categorical Status column this is a code bincount; drop the
+        # zero-count categories it reports so the summary lists real rows only
         status_counts = results_df['Status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
         
         report_lines = [
             "SEO CANONICAL TAG VALIDATION REPORT",
@@ -173,15 +220,22 @@ class ReportGenerator:
                 "-" * 15,
                 ""
             ])
-            
-            for _, row in issues_df.iterrows():
-                report_lines.append(f"URL: {row['URL']}")
-                report_lines.append(f"Status: {row['Status']}")
-                if pd.notna(row.get('Canonical URL')):
-                    report_lines.append(f"Canonical: {row['Canonical URL']}")
-                if pd.notna(row.get('Error')):
-                    report_lines.append(f"Error: {row['Error']}")
-                report_lines.append("")
+
+            # Compose one block per issue with vectorized string ops instead
+            # of iterrows; optional lines collapse to '' where the value is NaN
+            urls = issues_df['URL'].astype(str)
+            statuses = issues_df['Status'].astype(str)
+            canonicals = issues_df.get('Canonical URL', pd.Series(index=issues_df.index)).fillna('').astype(str)
+            errors = issues_df.get('Error', pd.Series(index=issues_df.index)).fillna('').astype(str)
+
+            blocks = (
+                'URL: ' + urls
+                + '\nStatus: ' + statuses
+                + np.where(canonicals != '', '\nCanonical: ' + canonicals, '')
+                + np.where(errors != '', '\nError: ' + errors, '')
+                + '\n'
+            )
+            report_lines.extend(blocks.tolist())
         
         # Add performance metrics
         if 'Response Time' in results_df.columns:
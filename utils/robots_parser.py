@@ -2,25 +2,52 @@
 Robots.txt parser for discovering sitemaps
 """
 
+import aiohttp
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 from typing import List, Dict, Optional
-import re
+import concurrent.futures
 
 class RobotsParser:
     """Parser for robots.txt files to discover sitemaps"""
-    
+
+    # URL suffix to sitemap type; xml is special-cased for index detection
+    _SUFFIX_MAP = {
+        'txt': 'Text Sitemap',
+        'gz': 'Compressed Sitemap',
+        'json': 'JSON Sitemap',
+    }
+
     def __init__(self, timeout: int = 30, user_agent: str = None):
         self.timeout = timeout
         self.user_agent = user_agent or "SEO-Canonical-Validator/1.0"
-        
-    def discover_sitemaps(self, domain: str) -> List[Dict]:
+
+        # Pooled session: robots.txt and the sitemap probes hit the same
+        # host, so everything after the first request reuses the keep-alive
+        # connection instead of paying a fresh TCP+TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': self.user_agent})
+
+    def discover_sitemaps(self, domain: str, check_common_on_404: bool = True) -> List[Dict]:
         """
         Discover sitemaps from robots.txt
-        
+
         Args:
             domain: The domain to check (with or without protocol)
-            
+            check_common_on_404: Probe the common sitemap paths when
+                robots.txt is missing (default True)
+
         Returns:
             List of sitemap dictionaries with url, type, status, and metadata
         """
@@ -35,83 +62,158 @@ class RobotsParser:
         
         try:
             # Fetch robots.txt
-            response = requests.get(
-                robots_url,
-                timeout=self.timeout,
-                headers={'User-Agent': self.user_agent}
-            )
-            
-            if response.status_code == 200:
-                return self._parse_robots_content(response.text, base_url)
-            else:
-                # Try common sitemap locations if robots.txt not found
-                return self._check_common_sitemap_locations(base_url)
-                
+            response = self.session.get(robots_url, timeout=self.timeout)
         except requests.RequestException as e:
+            # Connection failure: probing five more paths on the same host
+            # would only repeat it
             raise Exception(f"Failed to fetch robots.txt from {robots_url}: {str(e)}")
+
+        if response.status_code == 200:
+            return self._parse_robots_content(response.text, base_url)
+
+        if response.status_code >= 500:
+            # The server itself is failing; skip the common-path fallback
+            # that would hammer it with further requests
+            raise Exception(f"Server error (HTTP {response.status_code}) fetching {robots_url}")
+
+        if check_common_on_404:
+            # Try common sitemap locations if robots.txt not found
+            return self._check_common_sitemap_locations(base_url)
+
+        return []
     
     def _parse_robots_content(self, content: str, base_url: str) -> List[Dict]:
         """Parse robots.txt content to extract sitemap URLs"""
         sitemaps = []
         
         # Look for sitemap directives
-        sitemap_pattern = re.compile(r'^sitemap:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
-        matches = sitemap_pattern.findall(content)
-        
-        for match in matches:
-            sitemap_url = match.strip()
-            
+        candidates = []
+        for sitemap_url in self._iter_sitemap_directives(content):
             # Convert relative URLs to absolute
             if not sitemap_url.startswith(('http://', 'https://')):
                 sitemap_url = urljoin(base_url, sitemap_url)
-            
-            # Validate and categorize sitemap
-            sitemap_info = self._validate_sitemap(sitemap_url)
-            if sitemap_info:
-                sitemaps.append(sitemap_info)
-        
+
+            candidates.append(sitemap_url)
+
+        # Validate and categorize all candidates concurrently
+        sitemaps = self._validate_sitemaps(candidates)
+
         # If no sitemaps found in robots.txt, check common locations
         if not sitemaps:
             sitemaps = self._check_common_sitemap_locations(base_url)
         
         return sitemaps
-    
-    def _check_common_sitemap_locations(self, base_url: str) -> List[Dict]:
-        """Check common sitemap locations"""
-        common_paths = [
+
+    @staticmethod
+    def _iter_sitemap_directives(content: str):
+        """Yield sitemap directive values from robots.txt, one line at a time"""
+        for line in content.splitlines():
+            line = line.strip()
+            if line[:8].lower() == 'sitemap:':
+                value = line[8:].strip()
+                if value:
+                    yield value
+
+    def _check_common_sitemap_locations(self, base_url: str, exhaustive: bool = False) -> List[Dict]:
+        """Check common sitemap locations, most likely first"""
+        # Ordered by real-world prevalence; almost every site that exposes a
+        # sitemap does so at one of the priority paths
+        priority_paths = [
             '/sitemap.xml',
-            '/sitemap_index.xml',
+            '/sitemap_index.xml'
+        ]
+        fallback_paths = [
             '/sitemaps.xml',
             '/sitemap.txt',
             '/sitemap'
         ]
-        
-        sitemaps = []
-        
-        for path in common_paths:
-            sitemap_url = urljoin(base_url, path)
-            sitemap_info = self._validate_sitemap(sitemap_url)
-            if sitemap_info:
-                sitemaps.append(sitemap_info)
-        
-        return sitemaps
+
+        if exhaustive:
+            all_paths = priority_paths + fallback_paths
+            return self._validate_sitemaps([urljoin(base_url, path) for path in all_paths])
+
+        # Short-circuit: only probe the rarer variants when neither
+        # canonical location answered
+        sitemaps = self._validate_sitemaps([urljoin(base_url, path) for path in priority_paths])
+        if sitemaps:
+            return sitemaps
+        return self._validate_sitemaps([urljoin(base_url, path) for path in fallback_paths])
+
+    def _validate_sitemaps(self, sitemap_urls: List[str]) -> List[Dict]:
+        """Validate candidate sitemap URLs with concurrent HEAD probes"""
+        if not sitemap_urls:
+            return []
+
+        try:
+            results = asyncio.run(self._validate_sitemaps_async(sitemap_urls))
+        except RuntimeError:
+            # Called from inside a running event loop - probe concurrently on
+            # threads over the pooled sync session instead
+            workers = min(8, len(sitemap_urls))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._validate_sitemap, sitemap_urls))
+
+        return [info for info in results if info]
+
+    async def _validate_sitemaps_async(self, sitemap_urls: List[str]) -> List[Optional[Dict]]:
+        """Probe all candidate URLs on one event loop, bounded by a semaphore"""
+        semaphore = asyncio.BoundedSemaphore(5)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit_per_host=8)
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={'User-Agent': self.user_agent}
+        ) as session:
+
+            async def probe(sitemap_url: str) -> Optional[Dict]:
+                async with semaphore:
+                    return await self._validate_sitemap_async(session, sitemap_url)
+
+            return await asyncio.gather(*(probe(url) for url in sitemap_urls))
+
+    async def _validate_sitemap_async(self, session: aiohttp.ClientSession,
+                                      sitemap_url: str) -> Optional[Dict]:
+        """Async HEAD probe for a single sitemap URL"""
+        try:
+            async with session.head(sitemap_url, allow_redirects=True) as response:
+                if response.status == 200:
+                    content_type = response.headers.get('content-type', '').lower()
+
+                    # Determine sitemap type from the bare media type
+                    media_type = content_type.split(';', 1)[0]
+                    sitemap_type = self._determine_sitemap_type(sitemap_url, media_type)
+
+                    return {
+                        'url': sitemap_url,
+                        'type': sitemap_type,
+                        'status': 'Available',
+                        'content_type': content_type,
+                        'size': response.headers.get('content-length', 'Unknown')
+                    }
+                else:
+                    return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
     
     def _validate_sitemap(self, sitemap_url: str) -> Optional[Dict]:
         """Validate sitemap URL and determine type"""
         try:
             # Quick HEAD request to check if sitemap exists
-            response = requests.head(
+            response = self.session.head(
                 sitemap_url,
                 timeout=self.timeout,
-                headers={'User-Agent': self.user_agent},
                 allow_redirects=True
             )
             
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '').lower()
                 
-                # Determine sitemap type
-                sitemap_type = self._determine_sitemap_type(sitemap_url, content_type)
+                # Determine sitemap type from the bare media type
+                media_type = content_type.split(';', 1)[0]
+                sitemap_type = self._determine_sitemap_type(sitemap_url, media_type)
                 
                 return {
                     'url': sitemap_url,
@@ -129,21 +231,31 @@ class RobotsParser:
     def _determine_sitemap_type(self, url: str, content_type: str) -> str:
         """Determine the type of sitemap based on URL and content type"""
         url_lower = url.lower()
-        
-        if 'xml' in content_type or url_lower.endswith('.xml'):
-            if 'index' in url_lower:
-                return 'XML Index'
-            else:
-                return 'XML Sitemap'
-        elif 'text' in content_type or url_lower.endswith('.txt'):
+        suffix = url_lower.rpartition('.')[2]
+
+        if 'xml' in content_type or suffix == 'xml':
+            return 'XML Index' if 'index' in url_lower else 'XML Sitemap'
+
+        # Single dict dispatch on the suffix instead of an endswith chain
+        sitemap_type = self._SUFFIX_MAP.get(suffix)
+        if sitemap_type:
+            return sitemap_type
+
+        if 'text' in content_type:
             return 'Text Sitemap'
-        elif url_lower.endswith('.gz'):
-            return 'Compressed Sitemap'
-        elif 'json' in content_type or url_lower.endswith('.json'):
+        if 'json' in content_type:
             return 'JSON Sitemap'
-        else:
-            return 'Unknown Format'
+        return 'Unknown Format'
     
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
+
+    def __del__(self):
+        """Cleanup session on destruction"""
+        if hasattr(self, 'session'):
+            self.session.close()
+
     def get_sitemap_preview(self, sitemap_url: str, max_urls: int = 10) -> List[str]:
         """Get a preview of URLs from a sitemap"""
         try:
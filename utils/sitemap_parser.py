@@ -2,22 +2,96 @@
 Sitemap parser for extracting URLs from various sitemap formats
 """
 
+import re
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from urllib.parse import urljoin
 from typing import List, Set
 import gzip
 import json
 from io import BytesIO
 
+try:
+    # Optional: C-accelerated JSON parsing that takes bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+# One URL per line, optionally indented; matched directly on the raw bytes
+_TEXT_SITEMAP_URL = re.compile(rb'(?m)^[ \t]*(https?://\S+)')
+
+# Per-parser cap on cached extraction results (each entry is a URL list,
+# so this bounds memory, not just entry count)
+_URL_CACHE_MAX = 128
+
+# The namespace nearly every sitemap on the web declares
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Qualified tag -> whether it is a <sitemap> (index entry) element. A file
+# uses a handful of distinct tag strings, and lxml interns them, so after
+# the first <loc> per namespace this is a pointer-hash dict hit instead of
+# a suffix scan per element. Pre-seeded with the sitemaps.org tags (and
+# their unnamespaced variants) so the common case never runs the generic
+# suffix scan at all.
+_SITEMAP_TAG_CACHE = {
+    f'{{{SITEMAP_NS}}}sitemap': True,
+    f'{{{SITEMAP_NS}}}url': False,
+    'sitemap': True,
+    'url': False,
+}
+
+def _is_sitemap_tag(tag) -> bool:
+    """True when the (possibly namespaced) tag is a sitemap index entry"""
+    cached = _SITEMAP_TAG_CACHE.get(tag)
+    if cached is None:
+        cached = isinstance(tag, str) and (tag == 'sitemap' or tag.endswith('}sitemap'))
+        _SITEMAP_TAG_CACHE[tag] = cached
+    return cached
+
 class SitemapParser:
     """Parser for various sitemap formats (XML, text, compressed)"""
     
     def __init__(self, timeout: int = 30, user_agent: str = None):
         self.timeout = timeout
         self.user_agent = user_agent or "SEO-Canonical-Validator/1.0"
-        self.processed_sitemaps = set()  # Track processed sitemaps to avoid loops
-        
+        # Extracted URL lists keyed by sitemap URL, holding completed parses
+        # only; sitemaps currently being parsed sit in _in_flight, which is
+        # never evicted, so index cycles stay broken no matter how large the
+        # index is
+        self._url_cache = {}
+        self._in_flight = set()
+
+        # Pooled session: a sitemap index fans out into many child sitemaps
+        # on the same host, so all fetches after the first reuse a
+        # keep-alive connection instead of a fresh TCP+TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': self.user_agent})
+
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        """Cleanup session on destruction"""
+        if hasattr(self, 'session'):
+            self.session.close()
+
     def extract_urls(self, sitemap_url: str) -> List[str]:
         """
         Extract URLs from a sitemap
@@ -28,151 +102,160 @@ class SitemapParser:
         Returns:
             List of URLs found in the sitemap
         """
-        if sitemap_url in self.processed_sitemaps:
-            return []  # Avoid infinite loops
-            
-        self.processed_sitemaps.add(sitemap_url)
-        
+        cached = self._url_cache.get(sitemap_url)
+        if cached is not None:
+            return cached
+
+        if sitemap_url in self._in_flight:
+            return []  # Avoid infinite loops through self-referencing indexes
+
+        self._in_flight.add(sitemap_url)
         try:
-            # Fetch sitemap content
-            response = requests.get(
-                sitemap_url,
-                timeout=self.timeout,
-                headers={'User-Agent': self.user_agent}
-            )
+            # Fetch sitemap content over the pooled session
+            response = self.session.get(sitemap_url, timeout=self.timeout)
             response.raise_for_status()
-            
+
             # Determine content type and parse accordingly
             content_type = response.headers.get('content-type', '').lower()
-            content = response.content
-            
-            # Handle compressed content
-            if sitemap_url.endswith('.gz') or 'gzip' in content_type:
-                content = self._decompress_content(content)
-            
-            # Parse based on format
-            if self._is_xml_content(content, content_type):
-                return self._parse_xml_sitemap(content)
-            elif self._is_text_content(content_type):
-                return self._parse_text_sitemap(content)
-            elif self._is_json_content(content_type):
-                return self._parse_json_sitemap(content)
-            else:
-                # Try to auto-detect format
-                return self._auto_detect_and_parse(content)
-                
+            urls = self._parse_sitemap_content(sitemap_url, response.content, content_type)
+
+            # Only completed parses enter the cache, so eviction can never
+            # touch the guard protecting a parse still on the stack
+            if len(self._url_cache) >= _URL_CACHE_MAX:
+                self._url_cache.pop(next(iter(self._url_cache)))
+            self._url_cache[sitemap_url] = urls
+            return urls
+
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch sitemap {sitemap_url}: {str(e)}")
         except Exception as e:
             raise Exception(f"Failed to parse sitemap {sitemap_url}: {str(e)}")
+        finally:
+            self._in_flight.discard(sitemap_url)
+
+    def _parse_sitemap_content(self, sitemap_url: str, content: bytes,
+                               content_type: str) -> List[str]:
+        """Dispatch fetched sitemap bytes to the right format parser"""
+        # Handle compressed content: XML (the overwhelmingly common case
+        # for .gz sitemaps) streams straight from the decompressor into
+        # the parser, so the inflated document never exists in memory
+        if sitemap_url.endswith('.gz') or 'gzip' in content_type:
+            reader = gzip.GzipFile(fileobj=BytesIO(content))
+            try:
+                head = reader.peek(300)
+            except OSError:
+                # Not actually gzipped; fall through with the raw bytes
+                pass
+            else:
+                if self._sniff_format(head, content_type) == 'xml':
+                    return self._parse_xml_sitemap(reader)
+                content = reader.read()
+
+        # One sniff decides the parser; no repeated header/head checks
+        fmt = self._sniff_format(content, content_type)
+        if fmt == 'xml':
+            return self._parse_xml_sitemap(content)
+        if fmt == 'text':
+            return self._parse_text_sitemap(content)
+        if fmt == 'json':
+            return self._parse_json_sitemap(content)
+        return self._auto_detect_and_parse(content)
     
-    def _decompress_content(self, content: bytes) -> bytes:
-        """Decompress gzipped content"""
-        try:
-            return gzip.decompress(content)
-        except Exception:
-            # If decompression fails, return original content
-            return content
-    
-    def _is_xml_content(self, content: bytes, content_type: str) -> bool:
-        """Check if content is XML"""
-        return ('xml' in content_type or 
-                content.startswith(b'<?xml') or 
-                b'<urlset' in content[:200] or 
-                b'<sitemapindex' in content[:200])
-    
-    def _is_text_content(self, content_type: str) -> bool:
-        """Check if content is plain text"""
-        return 'text/plain' in content_type
-    
-    def _is_json_content(self, content_type: str) -> bool:
-        """Check if content is JSON"""
-        return 'json' in content_type
+    @staticmethod
+    def _sniff_format(content: bytes, content_type: str) -> str:
+        """Classify a sitemap payload as 'xml', 'text', 'json' or 'unknown'
+
+        Looks at the Content-Type header and one slice of the payload head,
+        so classification costs the same regardless of body size.
+        """
+        head = content[:256]
+        if ('xml' in content_type or head.startswith(b'<?xml')
+                or b'<urlset' in head or b'<sitemapindex' in head):
+            return 'xml'
+        if 'json' in content_type or head.lstrip()[:1] in (b'{', b'['):
+            return 'json'
+        if 'text/plain' in content_type:
+            return 'text'
+        return 'unknown'
     
-    def _parse_xml_sitemap(self, content: bytes) -> List[str]:
-        """Parse XML sitemap and extract URLs"""
+    def _parse_xml_sitemap(self, content) -> List[str]:
+        """Parse XML sitemap (bytes or a file-like source) via streaming iterparse"""
         urls = []
-        
+        child_sitemaps = []
+        source = content if hasattr(content, 'read') else BytesIO(content)
+
+        # Bind the append methods once; the loop below runs per <loc>, and
+        # on multi-million-URL sitemaps the repeated attribute lookups add up
+        add_url = urls.append
+        add_child = child_sitemaps.append
+
         try:
-            # Parse XML content
-            root = ET.fromstring(content)
-            
-            # Handle namespace
-            namespace = self._get_xml_namespace(root)
-            
-            # Check if this is a sitemap index
-            if root.tag.endswith('sitemapindex'):
-                # This is a sitemap index - recursively parse child sitemaps
-                for sitemap in root.findall(f'.//{{{namespace}}}sitemap'):
-                    loc_elem = sitemap.find(f'{{{namespace}}}loc')
-                    if loc_elem is not None and loc_elem.text:
-                        child_urls = self.extract_urls(loc_elem.text.strip())
-                        urls.extend(child_urls)
-            else:
-                # This is a regular sitemap - extract URLs
-                for url in root.findall(f'.//{{{namespace}}}url'):
-                    loc_elem = url.find(f'{{{namespace}}}loc')
-                    if loc_elem is not None and loc_elem.text:
-                        urls.append(loc_elem.text.strip())
-        
-        except ET.ParseError as e:
+            # Stream over <loc> end events only - the tag filter runs inside
+            # libxml2, so Python never sees the url/lastmod/priority elements;
+            # recover/huge_tree tolerate the malformed and oversized sitemaps
+            # real sites serve instead of rejecting them outright
+            for _, elem in etree.iterparse(source, events=('end',),
+                                           tag='{*}loc',
+                                           recover=True, huge_tree=True):
+                text = (elem.text or '').strip()
+                if text:
+                    parent = elem.getparent()
+                    if parent is not None and _is_sitemap_tag(parent.tag):
+                        # Sitemap index entry - parse the child sitemap later
+                        add_child(text)
+                    else:
+                        add_url(text)
+
+                # Free the processed element and its already-seen siblings so
+                # memory stays flat regardless of sitemap size
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+        except etree.XMLSyntaxError as e:
             raise Exception(f"XML parsing error: {str(e)}")
-        
+
+        # Recursively parse child sitemaps from a sitemap index
+        for child_url in child_sitemaps:
+            urls.extend(self.extract_urls(child_url))
+
         return urls
-    
-    def _get_xml_namespace(self, root) -> str:
-        """Extract XML namespace from root element"""
-        tag = root.tag
-        if tag.startswith('{'):
-            return tag[1:tag.find('}')]
-        return ''
-    
+
     def _parse_text_sitemap(self, content: bytes) -> List[str]:
         """Parse text sitemap (one URL per line)"""
-        urls = []
-        
         try:
-            text_content = content.decode('utf-8', errors='ignore')
-            lines = text_content.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line and line.startswith(('http://', 'https://')):
-                    urls.append(line)
-        
+            # Scan the raw bytes in one pass and only decode the matches,
+            # instead of decoding/splitting/stripping the whole body first
+            return [match.decode('utf-8', errors='ignore')
+                    for match in _TEXT_SITEMAP_URL.findall(content)]
         except Exception as e:
             raise Exception(f"Text parsing error: {str(e)}")
-        
-        return urls
     
     def _parse_json_sitemap(self, content: bytes) -> List[str]:
         """Parse JSON sitemap"""
-        urls = []
-        
         try:
-            json_data = json.loads(content.decode('utf-8'))
-            
-            # Handle different JSON sitemap formats
-            if isinstance(json_data, list):
-                # Array of URLs
-                for item in json_data:
-                    if isinstance(item, str):
-                        urls.append(item)
-                    elif isinstance(item, dict) and 'loc' in item:
-                        urls.append(item['loc'])
-            elif isinstance(json_data, dict):
-                # Object with URL array
-                if 'urls' in json_data:
-                    for url_data in json_data['urls']:
-                        if isinstance(url_data, str):
-                            urls.append(url_data)
-                        elif isinstance(url_data, dict) and 'loc' in url_data:
-                            urls.append(url_data['loc'])
-        
+            # orjson parses the raw bytes without a separate decode pass
+            if orjson is not None:
+                json_data = orjson.loads(content)
+            else:
+                json_data = json.loads(content.decode('utf-8'))
+
+            # Handle different JSON sitemap formats: a bare array of entries,
+            # or an object wrapping the array under 'urls'
+            if isinstance(json_data, dict):
+                json_data = json_data.get('urls', [])
+            if not isinstance(json_data, list):
+                return []
+
+            return [item if isinstance(item, str) else item['loc']
+                    for item in json_data
+                    if isinstance(item, str)
+                    or (isinstance(item, dict) and 'loc' in item)]
+
         except Exception as e:
             raise Exception(f"JSON parsing error: {str(e)}")
-        
-        return urls
     
     def _auto_detect_and_parse(self, content: bytes) -> List[str]:
         """Auto-detect format and parse accordingly"""
@@ -201,13 +284,15 @@ class SitemapParser:
     def get_sitemap_info(self, sitemap_url: str) -> dict:
         """Get detailed information about a sitemap"""
         try:
-            response = requests.head(
+            # One GET serves both purposes: its headers fill in the metadata
+            # and its body feeds the URL count, instead of a HEAD followed by
+            # a second full download
+            response = self.session.get(
                 sitemap_url,
                 timeout=self.timeout,
-                headers={'User-Agent': self.user_agent},
                 allow_redirects=True
             )
-            
+
             # Get basic info
             info = {
                 'url': sitemap_url,
@@ -216,19 +301,21 @@ class SitemapParser:
                 'size': response.headers.get('content-length', 'Unknown'),
                 'last_modified': response.headers.get('last-modified', 'Unknown')
             }
-            
-            # Get URL count by actually parsing (expensive but accurate)
+
+            # Get URL count by parsing the body we already have
             if response.status_code == 200:
                 try:
-                    urls = self.extract_urls(sitemap_url)
+                    content_type = response.headers.get('content-type', '').lower()
+                    urls = self._parse_sitemap_content(
+                        sitemap_url, response.content, content_type)
                     info['url_count'] = len(urls)
                 except:
                     info['url_count'] = 'Error'
             else:
                 info['url_count'] = 'N/A'
-            
+
             return info
-            
+
         except Exception as e:
             return {
                 'url': sitemap_url,